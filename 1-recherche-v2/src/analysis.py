@@ -0,0 +1,96 @@
+from typing import Dict, Iterable, List, Set, Tuple
+from lle import Action, World
+from grid import MOVES, Position, walkable_cells, reachable_from, target
+
+
+class MapAnalysis:
+    """
+    Analyse statique d'une carte, calculée une seule fois par problème.
+
+    Pour chaque agent :
+        - `deadly` : cases couvertes par un laser d'une autre couleur que l'agent de cette couleur
+          ne peut jamais bloquer (il ne peut atteindre aucune case du rayon en amont) ;
+        - `dead_ends` : cases depuis lesquelles l'agent ne peut plus atteindre de sortie ;
+        - `reachable` : cases que l'agent peut atteindre depuis sa position de départ sans se
+          retrouver dans une des cases précédentes.
+
+    Toutes les approximations sont faites dans le sens prudent (lasers ignorés pour l'atteignabilité),
+    de sorte qu'aucune action écartée ne peut faire partie d'une solution.
+    """
+
+    def __init__(self, world: World):
+        self.cells = walkable_cells(world)
+        self.n_agents = world.n_agents
+        starts = list(world.agents_positions)
+        # Atteignabilité sur-approximée (sans tenir compte des lasers) : sert à savoir qui peut bloquer un rayon
+        components = [reachable_from([start], self.cells) for start in starts]
+
+        self.deadly: List[Set[Position]] = []
+        self.dead_ends: List[Set[Position]] = []
+        self.reachable: List[Set[Position]] = []
+        beams = self._beams(world)
+        for agent in range(self.n_agents):
+            # Pour une couleur, une case n'est mortelle que si aucun des rayons qui la traversent ne peut être bloqué
+            unblockable: Dict[Tuple[int, Position], bool] = {}
+            for colour, beam in beams:
+                if colour == agent:
+                    continue
+                for k, position in enumerate(beam):
+                    blocked = colour < self.n_agents and any(upstream in components[colour] for upstream in beam[:k])
+                    unblockable[colour, position] = unblockable.get((colour, position), True) and not blocked
+            deadly = set(position for (_, position), is_deadly in unblockable.items() if is_deadly)
+            safe = self.cells - deadly
+            can_exit = reachable_from(world.exit_pos, safe)
+            self.deadly.append(deadly)
+            self.dead_ends.append(safe - can_exit)
+            self.reachable.append(reachable_from([starts[agent]], can_exit))
+        self.forbidden = [deadly | dead_ends for deadly, dead_ends in zip(self.deadly, self.dead_ends)]
+
+        exits = [set(pos for pos in world.exit_pos if pos in reachable) for reachable in self.reachable]
+        self.impossible = not self._has_exit_assignment(exits)
+
+    def _beams(self, world: World) -> List[Tuple[int, List[Position]]]:
+        """
+        Reconstruit les rayons (couleur, cases dans l'ordre depuis la source) à partir des cases laser.
+        Toute direction dans laquelle on trouve des cases laser de la même couleur est considérée comme
+        un rayon. Si deux rayons parallèles de même couleur se touchent, un rayon fictif peut apparaître,
+        mais une case n'est mortelle que si tous les rayons de cette couleur qui la traversent le sont.
+        """
+        laser_colours: Dict[Position, Set[int]] = {}
+        for position, laser in world.lasers:
+            laser_colours.setdefault(position, set()).add(laser.agent_id)
+        beams = []
+        for (i, j), source in world.laser_sources:
+            for di, dj in MOVES:
+                beam = []
+                position = (i + di, j + dj)
+                while source.agent_id in laser_colours.get(position, ()):
+                    beam.append(position)
+                    position = (position[0] + di, position[1] + dj)
+                if beam:
+                    beams.append((source.agent_id, beam))
+        return beams
+
+    def _has_exit_assignment(self, exits: List[Set[Position]]) -> bool:
+        """ Vrai si chaque agent peut être associé à une sortie atteignable distincte (couplage biparti) """
+        assigned: Dict[Position, int] = {}
+
+        def augment(agent: int, seen: Set[Position]) -> bool:
+            for exit_pos in exits[agent]:
+                if exit_pos in seen:
+                    continue
+                seen.add(exit_pos)
+                if exit_pos not in assigned or augment(assigned[exit_pos], seen):
+                    assigned[exit_pos] = agent
+                    return True
+            return False
+
+        return all(augment(agent, set()) for agent in range(self.n_agents))
+
+    def unreachable(self, targets: Iterable[Position]) -> List[Position]:
+        """ Cibles (gemmes, coins) qu'aucun agent ne peut atteindre """
+        return [position for position in targets if not any(position in reachable for reachable in self.reachable)]
+
+    def safe_actions(self, agent: int, position: Position, actions: Iterable[Action]) -> List[Action]:
+        """ Actions de l'agent qui ne le mènent ni sur une case mortelle ni dans une impasse """
+        return [action for action in actions if target(position, action) not in self.forbidden[agent]]
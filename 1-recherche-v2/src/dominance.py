@@ -0,0 +1,34 @@
+from typing import Dict, Hashable, List, Tuple
+
+
+class DominanceIndex:
+    """
+    Index des états augmentés (positions + ensemble d'objectifs atteints) déjà rencontrés.
+
+    Pour chaque clé de positions, on garde l'ensemble de Pareto des couples (masque, g) : un état
+    est dominé s'il existe un état aux mêmes positions qui a atteint un sur-ensemble de ses
+    objectifs (gemmes, coins) pour un coût inférieur ou égal. Un tel état ne peut pas mener à
+    une meilleure solution et peut être ignoré.
+    """
+
+    def __init__(self):
+        self.fronts: Dict[Hashable, List[Tuple[int, float]]] = {}
+
+    def is_dominated(self, key: Hashable, mask: int, g: float) -> bool:
+        for other_mask, other_g in self.fronts.get(key, []):
+            if other_mask & mask == mask and other_g <= g:
+                return True
+        return False
+
+    def add(self, key: Hashable, mask: int, g: float):
+        # On retire les entrées que le nouvel état domine
+        front = [(m, cost) for m, cost in self.fronts.get(key, []) if not (mask & m == m and g <= cost)]
+        front.append((mask, g))
+        self.fronts[key] = front
+
+    def push_if_not_dominated(self, key: Hashable, mask: int, g: float) -> bool:
+        """ Ajoute l'état s'il n'est pas dominé et renvoie True, sinon renvoie False """
+        if self.is_dominated(key, mask, g):
+            return False
+        self.add(key, mask, g)
+        return True
@@ -0,0 +1,47 @@
+from collections import deque
+from typing import Iterable, List, Set, Tuple
+from lle import Action, World
+
+
+Position = Tuple[int, int]
+
+# Déplacements élémentaires NORTH, SOUTH, EAST, WEST
+MOVES = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+
+ACTION_DELTAS = {
+    Action.NORTH: (-1, 0),
+    Action.SOUTH: (1, 0),
+    Action.EAST: (0, 1),
+    Action.WEST: (0, -1),
+    Action.STAY: (0, 0),
+}
+
+
+def target(position: Position, action: Action) -> Position:
+    """ Case visée par un agent qui effectue l'action depuis la position donnée """
+    di, dj = ACTION_DELTAS[action]
+    return position[0] + di, position[1] + dj
+
+
+def walkable_cells(world: World) -> Set[Position]:
+    """ Renvoie les cases sur lesquelles un agent peut se trouver (ni mur, ni source de laser) """
+    blocked = set(world.wall_pos) | set(pos for pos, _ in world.laser_sources)
+    return set((i, j) for i in range(world.height) for j in range(world.width) if (i, j) not in blocked)
+
+
+def neighbours(position: Position, cells: Set[Position]) -> List[Position]:
+    """ Renvoie les cases accessibles en un déplacement depuis la position donnée """
+    i, j = position
+    return [(i + di, j + dj) for di, dj in MOVES if (i + di, j + dj) in cells]
+
+
+def reachable_from(sources: Iterable[Position], cells: Set[Position]) -> Set[Position]:
+    """ Cases atteignables depuis les sources en ne passant que par les cases données """
+    reached = set(source for source in sources if source in cells)
+    queue = deque(reached)
+    while queue:
+        for neighbour in neighbours(queue.popleft(), cells):
+            if neighbour not in reached:
+                reached.add(neighbour)
+                queue.append(neighbour)
+    return reached
@@ -0,0 +1,75 @@
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+from lle import Action
+from problem import SearchProblem
+from search import Solution, astar
+
+
+T = TypeVar("T")
+
+
+class _CachedProblem:
+    """ Délègue tout au problème, sauf `get_successors` dont les résultats sont mémorisés """
+
+    def __init__(self, problem: SearchProblem, successors: Dict):
+        self.problem = problem
+        self.successors = successors
+        self.initial_state = problem.initial_state
+
+    def get_successors(self, state):
+        if state not in self.successors:
+            self.successors[state] = list(self.problem.get_successors(state))
+        return self.successors[state]
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+
+class IncrementalAStar(Generic[T]):
+    """
+    Replanification quand l'état de départ change (l'agent a avancé ou a dévié de son plan).
+
+    Deux choses sont conservées entre deux appels à `replan` :
+        - le dernier plan et les états par lesquels il passe : si le nouveau départ en fait partie,
+          la fin du plan est renvoyée sans aucune recherche ;
+        - les successeurs déjà générés : sinon une recherche A* est relancée depuis le nouveau départ,
+          mais les états déjà développés ne rappellent pas `world.step`.
+
+    La recherche relancée est exactement `search.astar` (même heuristique, même ordre) : une
+    replanification renvoie donc la même solution qu'une nouvelle recherche et ne développe jamais
+    plus d'états qu'elle. Une réparation locale de type LPA*/D* Lite n'est pas utilisée : dans LLE,
+    les prédécesseurs d'un état ne sont pas calculables et les transitions ne changent pas (les
+    lasers font partie de l'état), si bien que seule la recherche vers l'avant depuis le départ
+    est possible, et déplacer le départ invalide alors toute la table g.
+
+    `replan` prend un état du problème. Pour les problèmes dont l'état se déduit de l'état du monde,
+    `problem.get_problem_state(world.get_state())` le construit.
+    """
+
+    def __init__(self, problem: SearchProblem[T]):
+        self.problem = problem
+        self.successors: Dict[T, List[Tuple[T, Tuple[Action, ...], float]]] = {}
+        self.plan: Dict[T, int] = {} # État du dernier plan -> nombre d'actions déjà effectuées
+        self.actions: List[Tuple[Action, ...]] = []
+
+    def replan(self, state: T) -> Optional[Solution]:
+        """ Renvoie une solution depuis l'état donné, en réutilisant le dernier plan si possible """
+        if state in self.plan:
+            return Solution(actions=self.actions[self.plan[state]:])
+        cached = _CachedProblem(self.problem, self.successors)
+        cached.initial_state = state
+        solution = astar(cached)
+        self._remember(state, solution)
+        return solution
+
+    def _remember(self, start: T, solution: Optional[Solution]):
+        """ Mémorise le plan et les états qu'il traverse (tous déjà présents dans les successeurs) """
+        self.plan = {}
+        self.actions = []
+        if solution is None:
+            return
+        state = start
+        self.plan[state] = 0
+        for k, action in enumerate(solution.actions):
+            state = next(successor for successor, actions, _ in self.successors[state] if actions == action)
+            self.plan.setdefault(state, k + 1)
+        self.actions = list(solution.actions)
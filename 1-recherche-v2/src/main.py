@@ -1,8 +1,11 @@
-import cv2
 from lle import World
 from problem import SimpleSearchProblem, CornerSearchProblem, GemSearchProblem
 import search
 import argparse
+import json
+import os
+import threading
+from queue import Queue
 from time import time
 
 # Définition des problèmes disponibles
@@ -17,47 +20,144 @@ ALGORITHMS = {
     "bfs": search.bfs,
     "dfs": search.dfs,
     "astar": search.astar,
+    "beam": search.beam_search,
+    "bounded": search.bounded_best_first,
 }
 
-# Configuration de l'analyseur d'arguments en ligne de commande
-parser = argparse.ArgumentParser(description="AI Search Project")
-parser.add_argument("problem", choices=PROBLEMS.keys(), help="Choose a problem: simple, corner, or gem")
-parser.add_argument("algorithm", choices=ALGORITHMS.keys(), help="Choose an algorithm: bfs, dfs, or astar")
+VIDEO_EXTENSIONS = {".mp4": "mp4v", ".avi": "XVID"}
 
-args = parser.parse_args()
 
-# Charger le monde à partir d'un fichier (ajuster le chemin du fichier au besoin)
-w = World.from_file("cartes/gems")
+def render_frames(world: World, actions, frames: Queue):
+    """
+    Rejoue la solution depuis le début et place chaque image dans la file. None marque toujours la fin,
+    précédé de l'exception si le rendu a échoué, pour que le thread principal ne reste pas bloqué.
+    """
+    try:
+        world.reset()
+        frames.put(world.get_image())
+        for action in actions:
+            world.step(action)
+            frames.put(world.get_image())
+    except Exception as error:
+        frames.put(error)
+    finally:
+        frames.put(None)
 
-# Sélectionner le problème et l'algorithme en fonction des arguments
-problem_class = PROBLEMS[args.problem]
-algorithm = ALGORITHMS[args.algorithm]
 
-problem = problem_class(w)
+def start_renderer(world: World, actions, max_frames: int = 64) -> Queue:
+    """ Lance le rendu des images dans un thread séparé ; la file bornée limite la mémoire utilisée """
+    frames = Queue(maxsize=max_frames)
+    threading.Thread(target=render_frames, args=(world, actions, frames), daemon=True).start()
+    return frames
 
-# Exécuter la recherche sans limite de temps
-debut = time()
-solution = algorithm(problem)
-fin = time()
 
-if solution is None:
-    print("No solution found")
-    exit(0)
-else:
+def next_frames(frames: Queue):
+    """ Images de la file jusqu'à la fin du rendu ; relance dans le thread principal l'erreur du rendu """
+    while (img := frames.get()) is not None:
+        if isinstance(img, Exception):
+            raise img
+        yield img
+
+
+def show(frames: Queue):
+    """ Affiche les images au fur et à mesure qu'elles sont prêtes """
+    import cv2
+
+    for img in next_frames(frames):
+        cv2.imshow("Visualization", img)
+        cv2.waitKey(500)
+    # attend 1 sec et ferme la fenetre
+    cv2.waitKey(1000)
+    cv2.destroyAllWindows()
+
+
+def write(frames: Queue, output: str, fps: int) -> str:
+    """
+    Écrit les images dans une vidéo (.mp4, .avi) ou dans un répertoire d'images numérotées.
+    Si le codec vidéo n'est pas disponible, les images sont écrites dans un répertoire portant le nom
+    de la vidéo sans extension. Renvoie le chemin réellement écrit.
+    """
+    import cv2
+
+    base, extension = os.path.splitext(output)
+    writer = None
+    directory = None if extension.lower() in VIDEO_EXTENSIONS else output
+    n_frames = 0
+    for img in next_frames(frames):
+        if directory is None and writer is None:
+            height, width = img.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*VIDEO_EXTENSIONS[extension.lower()])
+            writer = cv2.VideoWriter(output, fourcc, fps, (width, height))
+            if not writer.isOpened():
+                print(f"Could not open a video writer for {output}, writing PNG frames to {base} instead")
+                writer = None
+                directory = base
+        if writer is not None:
+            writer.write(img)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            cv2.imwrite(os.path.join(directory, f"frame_{n_frames:04d}.png"), img)
+        n_frames += 1
+    if writer is not None:
+        writer.release()
+    return output if directory is None else directory
+
+
+if __name__ == "__main__":
+    # Configuration de l'analyseur d'arguments en ligne de commande
+    parser = argparse.ArgumentParser(description="AI Search Project")
+    parser.add_argument("problem", choices=PROBLEMS.keys(), help="Choose a problem: simple, corner, or gem")
+    parser.add_argument("algorithm", choices=ALGORITHMS.keys(), help="Choose an algorithm: bfs, dfs, astar, beam or bounded")
+    parser.add_argument("--map", default="cartes/gems", help="Path to the map file (default: cartes/gems)")
+    parser.add_argument(
+        "--mode",
+        choices=["show", "headless", "render"],
+        default="show",
+        help="show: replay the solution in a window, headless: only print JSON stats, render: write the replay to --output",
+    )
+    parser.add_argument("--output", default="replay.mp4", help="Video file (.mp4, .avi) or directory of images for --mode render")
+    parser.add_argument("--fps", type=int, default=2, help="Frames per second of the rendered video")
+    args = parser.parse_args()
+
+    # Charger le monde à partir d'un fichier
+    w = World.from_file(args.map)
+
+    # Sélectionner le problème et l'algorithme en fonction des arguments
+    problem_class = PROBLEMS[args.problem]
+    algorithm = ALGORITHMS[args.algorithm]
+
+    problem = problem_class(w)
+
+    # Exécuter la recherche sans limite de temps
+    debut = time()
+    solution = algorithm(problem)
+    fin = time()
+
+    if args.mode == "headless":
+        stats = {
+            "map": args.map,
+            "problem": args.problem,
+            "algorithm": args.algorithm,
+            "solved": solution is not None,
+            "n_steps": solution.n_steps if solution is not None else None,
+            "nodes_expanded": problem.nodes_expanded,
+            "time": fin - debut,
+        }
+        print(json.dumps(stats))
+        exit(0)
+
+    if solution is None:
+        print("No solution found")
+        exit(0)
+
     print(f"Solution found in {fin - debut} seconds")
     print(f"Number of steps: {solution.n_steps}")
     print(f"{problem.nodes_expanded} nodes expanded")
-    
-    # Réinitialiser le monde
-    w.reset()
-    
-    for actions in solution.actions:
-        w.step(actions)
-        img = w.get_image()
-        cv2.imshow("Visualization", img)
-        # Attendre que l'utilisateur appuie sur une touche pour passer à l'étape suivante
-        key = cv2.waitKey(500)
-# attend 1 sec et femre la fenetre
-cv2.waitKey(1000)
-cv2.destroyAllWindows()
 
+    # Les images sont calculées dans un autre thread pendant l'affichage ou l'écriture
+    frames = start_renderer(w, solution.actions)
+    if args.mode == "render":
+        written = write(frames, args.output, args.fps)
+        print(f"Replay written to {written}")
+    else:
+        show(frames)
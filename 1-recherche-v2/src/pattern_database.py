@@ -0,0 +1,198 @@
+"""
+Bases de données de motifs (pattern databases) pour GemSearchProblem.
+
+Chaque motif est un sous-ensemble des gemmes de la carte. Pour un motif, l'abstraction ne garde que la
+position des agents et les gemmes du motif déjà collectées. Les lasers et les collisions entre agents
+sont ignorés : le coût exact dans cette abstraction est donc un minorant du coût réel (heuristique
+admissible). Les tables sont calculées hors ligne puis sauvegardées au format `.npy` pour être
+chargées en mémoire partagée (memory-map, sans copie).
+
+Usage : python src/pattern_database.py cartes/gems [--pattern-size 4] [--workers N]
+"""
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Collection, List, Optional, Tuple
+import numpy as np
+from lle import World
+from grid import Position, walkable_cells, neighbours
+
+
+UNREACHABLE = int(np.iinfo(np.uint16).max)
+META_FILE = "meta.json"
+
+
+def _encode(cells: Tuple[int, ...], mask: int, n_cells: int, n_masks: int) -> int:
+    """ Indice à plat de l'état abstrait, dans l'ordre C du tableau (hauteur, largeur) * n_agents + (masques,) """
+    index = 0
+    for cell in cells:
+        index = index * n_cells + cell
+    return index * n_masks + mask
+
+
+def _submasks(mask: int) -> List[int]:
+    """ Tous les sous-ensembles du masque donné """
+    submasks = [0]
+    while mask:
+        bit = mask & -mask
+        submasks += [sub | bit for sub in submasks]
+        mask ^= bit
+    return submasks
+
+
+def _build_pattern(
+    output_file: str,
+    height: int,
+    width: int,
+    cells: List[Position],
+    exits: List[Position],
+    pattern: List[Position],
+    n_agents: int,
+):
+    """
+    Calcule la table d'un motif par un parcours en largeur en arrière depuis les états buts
+    (tous les agents sur une sortie et toutes les gemmes du motif collectées).
+    """
+    n_cells = height * width
+    n_masks = 1 << len(pattern)
+    full_mask = n_masks - 1
+
+    gem_bits = [0] * n_cells
+    for bit, (i, j) in enumerate(pattern):
+        gem_bits[i * width + j] |= 1 << bit
+    # Les déplacements sont réversibles : les prédécesseurs d'une case sont ses voisins et elle-même
+    walkable = set(cells)
+    moves = [[] for _ in range(n_cells)]
+    for i, j in cells:
+        moves[i * width + j] = [i * width + j] + [ni * width + nj for ni, nj in neighbours((i, j), walkable)]
+
+    dist = [UNREACHABLE] * (n_cells**n_agents * n_masks)
+    queue = deque()
+    for positions in product([i * width + j for i, j in exits if (i, j) in walkable], repeat=n_agents):
+        dist[_encode(positions, full_mask, n_cells, n_masks)] = 0
+        queue.append((positions, full_mask))
+
+    while queue:
+        positions, mask = queue.popleft()
+        cost = dist[_encode(positions, mask, n_cells, n_masks)] + 1
+        collected_here = 0
+        for cell in positions:
+            collected_here |= gem_bits[cell]
+        # Un agent sur une gemme l'a forcément collectée : sinon l'état n'a pas de prédécesseur
+        if collected_here & ~mask:
+            continue
+        previous_masks = [(mask & ~collected_here) | sub for sub in _submasks(mask & collected_here)]
+        for previous_positions in product(*(moves[cell] for cell in positions)):
+            for previous_mask in previous_masks:
+                index = _encode(previous_positions, previous_mask, n_cells, n_masks)
+                if dist[index] == UNREACHABLE:
+                    dist[index] = cost
+                    queue.append((previous_positions, previous_mask))
+
+    table = np.lib.format.open_memmap(output_file, mode="w+", dtype=np.uint16, shape=(height, width) * n_agents + (n_masks,))
+    table.reshape(-1)[:] = dist
+    table.flush()
+
+
+def _layout(world: World) -> dict:
+    """ Description de la carte enregistrée avec les tables : elles ne sont valables que pour cette carte """
+    return {
+        "height": world.height,
+        "width": world.width,
+        "n_agents": world.n_agents,
+        "gems": sorted([list(pos) for pos, _ in world.gems]),
+        "exits": sorted([list(pos) for pos in world.exit_pos]),
+        "walls": sorted([list(pos) for pos in world.wall_pos]),
+        "laser_sources": sorted([list(pos) for pos, _ in world.laser_sources]),
+    }
+
+
+def build(world: World, directory: str, pattern_size: int = 4, n_workers: Optional[int] = None):
+    """
+    Construit les bases de données de motifs de la carte dans le répertoire donné.
+    Les gemmes sont regroupées par motifs de `pattern_size` gemmes, chaque motif étant calculé
+    dans un processus séparé.
+    """
+    os.makedirs(directory, exist_ok=True)
+    cells = sorted(walkable_cells(world))
+    gems = sorted(pos for pos, _ in world.gems)
+    # Sans gemme, un motif vide donne encore la distance des agents aux sorties
+    patterns = [gems[k : k + pattern_size] for k in range(0, len(gems), pattern_size)] or [[]]
+    files = [f"pattern_{k}.npy" for k in range(len(patterns))]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                _build_pattern,
+                os.path.join(directory, file),
+                world.height,
+                world.width,
+                cells,
+                list(world.exit_pos),
+                pattern,
+                world.n_agents,
+            )
+            for file, pattern in zip(files, patterns)
+        ]
+        for future in futures:
+            future.result()
+
+    meta = {
+        **_layout(world),
+        "patterns": [[list(gem) for gem in pattern] for pattern in patterns],
+        "files": files,
+    }
+    with open(os.path.join(directory, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+
+class PatternDatabase:
+    """
+    Bases de données de motifs sauvegardées par `build`. Les métadonnées sont lues à la création,
+    les tables ne sont ouvertes (en memory-map, sans copie) qu'à la première consultation.
+    """
+
+    def __init__(self, directory: str, world: World):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        layout = _layout(world)
+        if any(meta.get(key) != value for key, value in layout.items()):
+            raise ValueError(f"The pattern database in {directory} was not built for this world")
+        self.patterns = [[tuple(gem) for gem in pattern] for pattern in meta["patterns"]]
+        self.files = meta["files"]
+        self.tables: Optional[List[np.ndarray]] = None
+
+    def _load(self) -> List[np.ndarray]:
+        if self.tables is None:
+            self.tables = [np.load(os.path.join(self.directory, file), mmap_mode="r") for file in self.files]
+        return self.tables
+
+    def heuristic(self, agents_positions: List[Position], gems_collected: Collection[Position]) -> float:
+        """ Maximum des coûts exacts des abstractions : admissible et cohérent """
+        coordinates = tuple(coordinate for position in agents_positions for coordinate in position)
+        best = 0
+        for pattern, table in zip(self.patterns, self._load()):
+            mask = 0
+            for bit, gem in enumerate(pattern):
+                if gem in gems_collected:
+                    mask |= 1 << bit
+            value = int(table[coordinates + (mask,)])
+            if value == UNREACHABLE:
+                return float("inf")
+            best = max(best, value)
+        return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the pattern databases of a map")
+    parser.add_argument("map", help="Path to the map file")
+    parser.add_argument("--output", help="Output directory (default: <map>.pdb)")
+    parser.add_argument("--pattern-size", type=int, default=4, help="Number of gems per pattern")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes")
+    args = parser.parse_args()
+
+    build(World.from_file(args.map), args.output or f"{args.map}.pdb", args.pattern_size, args.workers)
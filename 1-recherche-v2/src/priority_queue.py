@@ -30,6 +30,18 @@ class PriorityQueue(Generic[T]):
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
+    def truncate(self, n: int) -> list[T]:
+        # Keep only the n lowest-priority items and return the items that were dropped.
+        if len(self.heap) <= n:
+            return []
+        self.heap.sort()
+        dropped = [item for (_, _, item) in self.heap[n:]]
+        del self.heap[n:]
+        return dropped
+
     def update(self, item: T, priority: float):
         # If item already in priority queue with higher priority, update its priority and rebuild the heap.
         # If item already in priority queue with equal or lower priority, do nothing.
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Iterable, Generic, TypeVar, Set, List
+from typing import Tuple, Iterable, Generic, TypeVar, Set, List, Optional
 from lle import World, Action, WorldState
 from itertools import product
+import numpy as np
+from pattern_database import PatternDatabase
+from analysis import MapAnalysis
 
 
 T = TypeVar("T")
@@ -19,6 +22,10 @@ class SearchProblem(ABC, Generic[T]):
         world.reset()
         self.initial_state = world.get_state()
         self.nodes_expanded = 0
+        # Cases mortelles, impasses et cibles inaccessibles, calculées une seule fois pour la carte
+        self.analysis = MapAnalysis(world)
+        self.impossible = self.analysis.impossible
+        self.exit_array = np.array(world.exit_pos).reshape(-1, 2)
 
     @abstractmethod
     def is_goal_state(self, problem_state: T) -> bool:
@@ -37,6 +44,37 @@ class SearchProblem(ABC, Generic[T]):
     def heuristic(self, problem_state: T) -> float:
         return 0.0
 
+    def heuristic_batch(self, problem_states: List[T]) -> List[float]:
+        """
+        Heuristique de plusieurs états à la fois (par exemple tous les successeurs d'un état).
+        Les sous-classes peuvent la vectoriser, elle doit renvoyer les mêmes valeurs que `heuristic`.
+        """
+        return [self.heuristic(problem_state) for problem_state in problem_states]
+
+    def get_problem_state(self, world_state: WorldState) -> T:
+        """Construit l'état du problème correspondant à l'état du monde donné"""
+        return world_state
+
+    def dominance_key(self, problem_state: T) -> Optional[Tuple[Tuple[Tuple[int, int], ...], int]]:
+        """
+        Renvoie les positions des agents et le masque des objectifs atteints, ou None si le problème
+        ne permet pas de comparer ses états par dominance.
+        """
+        return None
+
+    def available_joint_actions(self) -> Iterable[Tuple[Action, ...]]:
+        """
+        Renvoie les actions jointes possibles dans l'état courant du monde, sans celles qui mènent
+        un agent sur une case mortelle ou dans une impasse.
+        """
+        if self.impossible:
+            return []
+        available_actions = [
+            self.analysis.safe_actions(agent, position, actions)
+            for agent, (position, actions) in enumerate(zip(self.world.agents_positions, self.world.available_actions()))
+        ]
+        return product(*available_actions)
+
 class SimpleSearchProblem(SearchProblem[WorldState]):
 
     def is_goal_state(self, state: WorldState) -> bool:
@@ -52,7 +90,7 @@ class SimpleSearchProblem(SearchProblem[WorldState]):
          # Si le monde est terminé, on ne peut pas aller plus loin
         if self.world.done: return []
         
-        all_actions_combinations = product(*self.world.available_actions()) 
+        all_actions_combinations = self.available_joint_actions() 
 
         for actions in all_actions_combinations:
            
@@ -72,6 +110,13 @@ class SimpleSearchProblem(SearchProblem[WorldState]):
             total_distance += min(distances)
         return total_distance
 
+    def heuristic_batch(self, states: List[WorldState]) -> List[float]:
+        """ Version vectorisée de `heuristic` """
+        if not states: return []
+        positions = _positions_array([state.agents_positions for state in states])
+        distances = _manhattan(positions, self.exit_array) # (états, agents, sorties)
+        return distances.min(axis=-1).sum(axis=-1).tolist()
+
 
 class CornerProblemState:
     def __init__(self, world_state, positions: List[Tuple[int, int]], visited_corners: Set[Tuple[int, int]]):
@@ -100,8 +145,22 @@ class CornerSearchProblem(SearchProblem[CornerProblemState]):
     def __init__(self, world: World):
         super().__init__(world)
         self.corners = [(0, 0), (0, world.width - 1), (world.height - 1, 0), (world.height - 1, world.width - 1)]
+        self.corner_bits = {corner: 1 << k for k, corner in enumerate(self.corners)}
+        self.corner_array = np.array(self.corners)
+        self.impossible = self.impossible or len(self.analysis.unreachable(self.corners)) > 0
         self.initial_state = CornerProblemState(world.get_state(), world.agents_positions, set())
 
+    def get_problem_state(self, world_state: WorldState) -> CornerProblemState:
+        """ Les coins déjà visités ne font pas partie de l'état du monde : il faut suivre les états du problème """
+        raise NotImplementedError("The visited corners cannot be deduced from a world state")
+
+    def dominance_key(self, state: CornerProblemState) -> Tuple[Tuple[Tuple[int, int], ...], int]:
+        """ Positions des agents et masque des coins visités """
+        mask = 0
+        for corner in state.visited_corners:
+            mask |= self.corner_bits[corner]
+        return tuple(state.positions), mask
+
     def is_goal_state(self, state: CornerProblemState) -> bool:
         """ True si tous les coins ont été visités et que tous les agents sont sur une case de sortie """
         if len(state.visited_corners) != len(self.corners):
@@ -115,7 +174,7 @@ class CornerSearchProblem(SearchProblem[CornerProblemState]):
         
         if self.world.done: return []
 
-        all_actions_combinations = product(*self.world.available_actions())
+        all_actions_combinations = self.available_joint_actions()
         
         for actions in all_actions_combinations:
             
@@ -138,6 +197,16 @@ class CornerSearchProblem(SearchProblem[CornerProblemState]):
                 max_distance = max(max_distance, max(distances))
         return max_distance
 
+    def heuristic_batch(self, states: List[CornerProblemState]) -> List[float]:
+        """ Version vectorisée de `heuristic` """
+        if not states: return []
+        positions = _positions_array([state.positions for state in states])
+        unvisited = np.array([[corner not in state.visited_corners for corner in self.corners] for state in states])
+        distances = _manhattan(positions, self.corner_array) # (états, agents, coins)
+        # Les coins visités sont ignorés (-1) ; sans coin non visité, l'heuristique vaut 0
+        distances = np.where(unvisited[:, None, :], distances, -1)
+        return np.maximum(distances.max(axis=(1, 2)), 0).tolist()
+
 
 class GemProblemState:
     def __init__(self, world_state: WorldState, gems_collected: Set[Tuple[int, int]]):
@@ -159,9 +228,33 @@ class GemProblemState:
         return GemProblemState(new_world_state, new_gems_collected)
 
 class GemSearchProblem(SearchProblem[GemProblemState]):
-    def __init__(self, world: World):
+    def __init__(self, world: World, pattern_database: Optional[str] = None):
         super().__init__(world)
         self.initial_state = GemProblemState(world.get_state(), set())
+        self.gem_bits = {pos: 1 << k for k, (pos, _) in enumerate(world.gems)}
+        self.gem_array = np.array([pos for pos, _ in world.gems]).reshape(-1, 2)
+        # Distance de chaque gemme à la sortie la plus proche (0 s'il n'y a pas de sortie)
+        if len(self.exit_array) > 0:
+            self.gem_exit_distances = _manhattan(self.gem_array[None], self.exit_array)[0].min(axis=-1)
+        else:
+            self.gem_exit_distances = np.zeros(len(self.gem_array), dtype=int)
+        self.impossible = self.impossible or len(self.analysis.unreachable(self.gem_bits)) > 0
+        # Bases de données de motifs construites par `pattern_database.build` (tables chargées à la première utilisation)
+        self.pattern_database = None
+        if pattern_database is not None:
+            self.pattern_database = PatternDatabase(pattern_database, world)
+
+    def get_problem_state(self, world_state: WorldState) -> GemProblemState:
+        """ Les gemmes collectées sont déduites de l'état du monde """
+        gems_collected = set(pos for (pos, _), collected in zip(self.world.gems, world_state.gems_collected) if collected)
+        return GemProblemState(world_state, gems_collected)
+
+    def dominance_key(self, state: GemProblemState) -> Tuple[Tuple[Tuple[int, int], ...], int]:
+        """ Positions des agents et masque des gemmes collectées """
+        mask = 0
+        for gem in state.gems_collected:
+            mask |= self.gem_bits[gem]
+        return tuple(state.world_state.agents_positions), mask
 
     def is_goal_state(self, state: GemProblemState) -> bool:
         """ True si toutes les gemmes ont été collectées et que tous les agents sont sur une case de sortie """
@@ -176,7 +269,7 @@ class GemSearchProblem(SearchProblem[GemProblemState]):
         
         if self.world.done: return []
 
-        all_actions_combinations = product(*self.world.available_actions())
+        all_actions_combinations = self.available_joint_actions()
         
         for actions in all_actions_combinations:
             
@@ -190,6 +283,8 @@ class GemSearchProblem(SearchProblem[GemProblemState]):
    
     def heuristic(self, problem_state: GemProblemState) -> float:
         """ Renvoie la distance de Manhattan entre la position de chaque agent et la gemme la plus proche """
+        if self.pattern_database is not None:
+            return self.pattern_database.heuristic(problem_state.world_state.agents_positions, problem_state.gems_collected)
 
         # Liste des gemmes non collectées
         uncollected_gems = [gem[0] for gem in self.world.gems if gem[0] not in problem_state.gems_collected]
@@ -213,8 +308,38 @@ class GemSearchProblem(SearchProblem[GemProblemState]):
 
         return total_distance
 
-    
+    def heuristic_batch(self, states: List[GemProblemState]) -> List[float]:
+        """ Version vectorisée de `heuristic` """
+        if not states: return []
+        if self.pattern_database is not None:
+            return [self.heuristic(state) for state in states]
+
+        positions = _positions_array([state.world_state.agents_positions for state in states])
+        uncollected = np.array([[gem not in state.gems_collected for gem in self.gem_bits] for state in states]).reshape(len(states), -1)
+        has_uncollected = uncollected.any(axis=1)
+
+        if len(self.exit_array) > 0:
+            exit_distances = _manhattan(positions, self.exit_array).min(axis=-1).sum(axis=-1)
+        else:
+            exit_distances = np.zeros(len(states), dtype=int)
+
+        if len(self.gem_array) > 0:
+            gem_distances = _manhattan(positions, self.gem_array) # (états, agents, gemmes)
+            # Les gemmes collectées sont ignorées pour la gemme la plus proche de chaque agent
+            far = gem_distances.max() + 1
+            nearest_gems = np.where(uncollected[:, None, :], gem_distances, far).min(axis=-1).sum(axis=-1)
+            gems_to_exit = (uncollected * self.gem_exit_distances).sum(axis=-1)
+        else:
+            nearest_gems = gems_to_exit = np.zeros(len(states), dtype=int)
+
+        return np.where(has_uncollected, nearest_gems + gems_to_exit, exit_distances).tolist()
 
 
+def _positions_array(positions: List[List[Tuple[int, int]]]) -> np.ndarray:
+    """ Positions des agents de plusieurs états sous forme de tableau (états, agents, 2) """
+    return np.array(positions).reshape(len(positions), -1, 2)
 
 
+def _manhattan(positions: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """ Distances de Manhattan entre des positions (états, agents, 2) et des cibles (cibles, 2) : (états, agents, cibles) """
+    return np.abs(positions[:, :, None, :] - targets[None, None, :, :]).sum(axis=-1)
@@ -1,6 +1,6 @@
 from lle import World
 from problem import SimpleSearchProblem, CornerSearchProblem, GemSearchProblem
-from search import dfs, bfs, astar
+from search import dfs, bfs, astar, beam_search, bounded_best_first
 
 from time import time
 import sys
@@ -28,7 +28,7 @@ if __name__ == "__main__":
 
     
 
-    algos = [(dfs, "dfs"), (bfs, "bfs"), (astar, "astar")]
+    algos = [(dfs, "dfs"), (bfs, "bfs"), (astar, "astar"), (beam_search, "beam"), (bounded_best_first, "bounded")]
     
     print("\033c")
     for algo, name in algos:
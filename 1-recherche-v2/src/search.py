@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 from lle import Action
 from problem import SearchProblem
 
-from collections import deque
+from collections import deque, OrderedDict
 from priority_queue import PriorityQueue
+from dominance import DominanceIndex
 
 
 @dataclass
@@ -16,6 +17,15 @@ class Solution:
         return len(self.actions)
 
 
+def _not_dominated(problem: SearchProblem, dominance: DominanceIndex, state, g: float) -> bool:
+    """ Enregistre l'état dans l'index de dominance et renvoie False s'il est dominé """
+    key = problem.dominance_key(state)
+    if key is None:
+        return True
+    positions, mask = key
+    return dominance.push_if_not_dominated(positions, mask, g)
+
+
 def bfs(problem: SearchProblem) -> Optional[Solution]:
     """ Recherche en largeur (Breadth-First Search) """
     
@@ -23,6 +33,8 @@ def bfs(problem: SearchProblem) -> Optional[Solution]:
     frontier = deque([start_state]) 
     explored = set([start_state]) 
     path_to = {start_state: []} # Dictionnaire pour mémoriser le chemin vers chaque état
+    dominance = DominanceIndex() # États augmentés (gemmes, coins) dominés par un état déjà atteint
+    _not_dominated(problem, dominance, start_state, 0)
 
     while frontier:
         current_state = frontier.popleft() # On récupère le premier état de la file
@@ -33,6 +45,8 @@ def bfs(problem: SearchProblem) -> Optional[Solution]:
         for successor, actions, _ in problem.get_successors(current_state):
             if successor not in explored:
                 explored.add(successor)
+                if not _not_dominated(problem, dominance, successor, len(path_to[current_state]) + 1):
+                    continue
                 frontier.append(successor)
                 path_to[successor] = path_to[current_state] + [actions]
 
@@ -67,10 +81,13 @@ def astar(problem: SearchProblem) -> Optional[Solution]:
     
     current_state = problem.initial_state
     frontier = PriorityQueue()
-    frontier.push(current_state, problem.heuristic(current_state)) # On ajoute l'état initial à la file
+    h_values = {current_state: problem.heuristic(current_state)} # h(n), calculée une seule fois par état
+    frontier.push(current_state, h_values[current_state]) # On ajoute l'état initial à la file
     g_values = {current_state: 0} # g(n)
     path_to = {current_state: []} # Dictionnaire pour mémoriser le chemin vers chaque état
     explored = set()  
+    dominance = DominanceIndex() # États augmentés (gemmes, coins) dominés par un état déjà atteint
+    _not_dominated(problem, dominance, current_state, 0)
 
     while not frontier.isEmpty():
         current_state = frontier.pop()
@@ -82,14 +99,152 @@ def astar(problem: SearchProblem) -> Optional[Solution]:
         if problem.is_goal_state(current_state):
             return Solution(actions=path_to[current_state])
 
-        for successor, action, action_cost in problem.get_successors(current_state):
+        successors = list(problem.get_successors(current_state))
+        # L'heuristique des nouveaux successeurs est évaluée en une seule fois
+        new_states = list(dict.fromkeys(successor for successor, _, _ in successors if successor not in h_values))
+        h_values.update(zip(new_states, problem.heuristic_batch(new_states)))
+
+        for successor, action, action_cost in successors:
             tentative_g_value = g_values[current_state] + action_cost # On calcule le coût du chemin jusqu'à l'état successeur
 
             if successor not in g_values or tentative_g_value < g_values[successor]:
+                if not _not_dominated(problem, dominance, successor, tentative_g_value):
+                    continue
                 g_values[successor] = tentative_g_value # On met à jour le coût du chemin jusqu'à l'état successeur
-                f_value = tentative_g_value + problem.heuristic(successor) # On calcule la valeur de f(n) = g(n) + h(n)
+                f_value = tentative_g_value + h_values[successor] # On calcule la valeur de f(n) = g(n) + h(n)
                 if successor not in explored:
                     frontier.update(successor, f_value)
                 path_to[successor] = path_to[current_state] + [action]
 
     return None
+
+
+def beam_search(problem: SearchProblem, beam_width: int = 100, max_width: Optional[int] = None) -> Optional[Solution]:
+    """
+    Recherche en faisceau (Beam Search) : à chaque profondeur, seuls les `beam_width` états de plus
+    petite heuristique sont gardés, ce qui borne la mémoire utilisée par niveau.
+    Si aucune solution n'est trouvée alors que des états ont été écartés, la largeur est doublée
+    (jusqu'à `max_width` si elle est donnée). Les noeuds développés s'accumulent dans `problem.nodes_expanded`.
+    """
+    return _widening(_beam_search, problem, beam_width, max_width)
+
+
+def bounded_best_first(problem: SearchProblem, width: int = 1000, max_width: Optional[int] = None) -> Optional[Solution]:
+    """
+    Recherche du meilleur d'abord (f = g + h) dont la frontière est limitée à `width` états : quand elle
+    déborde, les états de plus grand f sont écartés et oubliés. Seuls les `width` derniers états développés
+    sont mémorisés, la mémoire est donc bornée par la largeur. Même élargissement que `beam_search`.
+    """
+    return _widening(_bounded_best_first, problem, width, max_width)
+
+
+def _widening(search, problem: SearchProblem, width: int, max_width: Optional[int]) -> Optional[Solution]:
+    """ Relance la recherche en doublant la largeur tant qu'elle échoue à cause d'états écartés """
+    while True:
+        solution, truncated = search(problem, width)
+        if solution is not None or not truncated or (max_width is not None and width >= max_width):
+            return solution
+        width = width * 2 if max_width is None else min(width * 2, max_width)
+
+
+def _actions_to(node) -> list:
+    """ Remonte les pointeurs parents d'un noeud (état, noeud parent, actions) pour reconstruire le chemin """
+    path = []
+    while node[1] is not None:
+        path.append(node[2])
+        node = node[1]
+    path.reverse()
+    return path
+
+
+def _beam_search(problem: SearchProblem, beam_width: int) -> Tuple[Optional[Solution], bool]:
+    """
+    Renvoie la solution trouvée (ou None) et si des états ont été écartés. Les chemins sont partagés
+    par pointeurs parents et seuls les 2 * `beam_width` derniers états gardés sont mémorisés pour éviter
+    les retours en arrière : la mémoire ne dépend que de la largeur et de la profondeur.
+    """
+    beam = [(problem.initial_state, None, None)] # Noeuds (état, noeud parent, actions jointes)
+    closed = OrderedDict.fromkeys([problem.initial_state]) # Derniers états gardés, les plus anciens sont oubliés
+    truncated = False
+    # Quand des états sont oubliés, un même état peut revenir : on borne la profondeur d'un passage
+    max_depth = problem.world.width * problem.world.height
+    depth = 0
+
+    while beam:
+        candidates = {}
+        for node in beam:
+            if problem.is_goal_state(node[0]):
+                return Solution(actions=_actions_to(node)), truncated
+            for successor, actions, _ in problem.get_successors(node[0]):
+                if successor not in closed and successor not in candidates:
+                    candidates[successor] = (successor, node, actions)
+
+        depth += 1
+        if depth > max_depth:
+            return None, True
+        states = list(candidates)
+        if len(states) > beam_width:
+            truncated = True
+            h_values = problem.heuristic_batch(states)
+            best = sorted(range(len(states)), key=lambda k: h_values[k])[:beam_width]
+            states = [states[k] for k in best]
+        for state in states:
+            closed[state] = None
+        while len(closed) > 2 * beam_width:
+            closed.popitem(last=False)
+            truncated = True
+        beam = [candidates[state] for state in states]
+
+    return None, truncated
+
+
+def _bounded_best_first(problem: SearchProblem, width: int) -> Tuple[Optional[Solution], bool]:
+    """
+    Renvoie la solution trouvée (ou None) et si des états ont été écartés. La frontière contient au plus
+    2 * `width` entrées et l'ensemble des états développés au plus `width` : la mémoire ne dépend que de la largeur.
+    """
+    start_state = problem.initial_state
+    frontier = PriorityQueue()
+    frontier.push((start_state, 0, (start_state, None, None)), problem.heuristic(start_state)) # Triplets (état, g, noeud)
+    open_g = {start_state: 0} # Meilleur g des états présents dans la frontière
+    closed = OrderedDict() # Derniers états développés et leur g, les plus anciens sont oubliés
+    truncated = False
+    # Quand des états sont oubliés, un même état peut être redéveloppé : on borne le travail d'un passage
+    max_expansions = width * problem.world.width * problem.world.height
+    expansions = 0
+
+    while not frontier.isEmpty():
+        state, g_value, node = frontier.pop()
+        if open_g.get(state) != g_value: continue # Entrée périmée : un meilleur chemin a été trouvé ou l'état a été écarté
+        del open_g[state]
+
+        if problem.is_goal_state(state):
+            return Solution(actions=_actions_to(node)), truncated
+
+        expansions += 1
+        if expansions > max_expansions:
+            return None, True
+        closed[state] = g_value
+        closed.move_to_end(state)
+        if len(closed) > width:
+            closed.popitem(last=False)
+            truncated = True
+
+        successors = [
+            (successor, actions, g_value + cost)
+            for successor, actions, cost in problem.get_successors(state)
+            if g_value + cost < min(closed.get(successor, float("inf")), open_g.get(successor, float("inf")))
+        ]
+        h_values = problem.heuristic_batch([successor for successor, _, _ in successors])
+        for (successor, actions, successor_g), h_value in zip(successors, h_values):
+            open_g[successor] = successor_g
+            frontier.push((successor, successor_g, (successor, node, actions)), successor_g + h_value)
+
+        # On ne garde que les `width` meilleurs états (le tri n'est fait que quand la frontière a doublé)
+        if len(frontier) > 2 * width:
+            truncated = True
+            for dropped, dropped_g, _ in frontier.truncate(width):
+                if open_g.get(dropped) == dropped_g:
+                    del open_g[dropped]
+
+    return None, truncated
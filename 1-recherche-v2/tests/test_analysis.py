@@ -0,0 +1,71 @@
+from lle import World, Action
+from analysis import MapAnalysis
+from problem import SimpleSearchProblem, GemSearchProblem
+from search import astar, bfs
+
+
+def test_1_agent_impossible_detected():
+    world = World.from_file("cartes/1_agent/impossible")
+    problem = SimpleSearchProblem(world)
+    assert problem.impossible
+    assert bfs(problem) is None
+    assert problem.nodes_expanded <= 1
+
+
+def test_2_agents_impossible_detected():
+    # Une seule sortie est atteignable pour deux agents
+    world = World.from_file("cartes/2_agents/impossible")
+    problem = SimpleSearchProblem(world)
+    assert problem.impossible
+    assert astar(problem) is None
+    assert problem.nodes_expanded <= 1
+
+
+def test_possible_maps():
+    for map_file in ["cartes/1_agent/zigzag", "cartes/2_agents/zigzag", "cartes/2_agents/vide", "cartes/gems", "cartes/corners"]:
+        assert not MapAnalysis(World.from_file(map_file)).impossible
+
+
+def test_deadly_laser_cells():
+    # L'agent 1 ne peut pas atteindre le rayon de sa couleur pour le bloquer
+    world = World(
+        """
+        .   S0 . X
+        L1E .  . .
+        @   @  @ @
+        S1  .  . X"""
+    )
+    analysis = MapAnalysis(world)
+    assert analysis.deadly[0] == {(1, 1), (1, 2), (1, 3)}
+    assert analysis.deadly[1] == set()
+    assert not analysis.impossible
+
+    problem = SimpleSearchProblem(world)
+    successors = list(problem.get_successors(problem.initial_state))
+    assert len(successors) == 6
+    for _, actions, _ in successors:
+        assert actions[0] != Action.SOUTH
+
+
+def test_blockable_laser_is_not_deadly():
+    # Seule la première case du rayon ne peut pas être protégée par l'agent 1
+    world = World(
+        """
+        S0 .   . X
+        .  L1E . .
+        S1 .   . X"""
+    )
+    analysis = MapAnalysis(world)
+    assert analysis.deadly[0] == {(1, 2)}
+
+
+def test_unreachable_gem():
+    world = World(
+        """
+        S0 . X
+        @  @ @
+        G  . ."""
+    )
+    problem = GemSearchProblem(world)
+    assert problem.impossible
+    assert astar(problem) is None
@@ -0,0 +1,62 @@
+from lle import World
+from search import astar, beam_search, bounded_best_first
+from problem import SimpleSearchProblem, GemSearchProblem
+
+from .utils import check_world_done
+
+
+def test_beam_zigzag():
+    world = World.from_file("cartes/1_agent/zigzag")
+    problem = SimpleSearchProblem(world)
+    solution = beam_search(problem, beam_width=10)
+    check_world_done(problem, solution)
+
+
+TRAP = """
+.  . . . .
+S0 @ @ @ .
+.  . . @ X"""
+
+
+def test_beam_widens():
+    # Avec un faisceau de largeur 1, la recherche gloutonne se bloque dans le cul-de-sac et doit s'élargir
+    world = World(TRAP)
+    problem = SimpleSearchProblem(world)
+    solution = beam_search(problem, beam_width=1)
+    check_world_done(problem, solution)
+
+
+def test_beam_max_width():
+    world = World(TRAP)
+    problem = SimpleSearchProblem(world)
+    assert beam_search(problem, beam_width=1, max_width=1) is None
+
+
+def test_beam_gems():
+    world = World.from_file("cartes/gems")
+    problem = GemSearchProblem(world)
+    solution = beam_search(problem, beam_width=20)
+    check_world_done(problem, solution)
+    assert world.n_gems == world.gems_collected
+
+
+def test_bounded_best_first_zigzag():
+    world = World.from_file("cartes/1_agent/zigzag")
+    problem = SimpleSearchProblem(world)
+    solution = bounded_best_first(problem, width=1000)
+    assert solution.n_steps == astar(SimpleSearchProblem(world)).n_steps
+    check_world_done(problem, solution)
+
+
+def test_bounded_best_first_gems():
+    world = World.from_file("cartes/gems")
+    problem = GemSearchProblem(world)
+    solution = bounded_best_first(problem, width=10)
+    check_world_done(problem, solution)
+    assert world.n_gems == world.gems_collected
+
+
+def test_impossible():
+    world = World.from_file("cartes/2_agents/impossible")
+    assert beam_search(SimpleSearchProblem(world)) is None
+    assert bounded_best_first(SimpleSearchProblem(world)) is None
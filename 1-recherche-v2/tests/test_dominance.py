@@ -0,0 +1,61 @@
+from lle import World
+from dominance import DominanceIndex
+from problem import GemSearchProblem, CornerSearchProblem, CornerProblemState
+from search import astar, bfs
+
+from .utils import check_world_done
+
+
+def test_superset_with_lower_cost_dominates():
+    index = DominanceIndex()
+    assert index.push_if_not_dominated(((0, 0),), 0b011, 4)
+    assert index.is_dominated(((0, 0),), 0b001, 4)
+    assert index.is_dominated(((0, 0),), 0b011, 5)
+    assert not index.is_dominated(((0, 0),), 0b001, 3)
+    assert not index.is_dominated(((0, 0),), 0b100, 5)
+    assert not index.is_dominated(((0, 1),), 0b001, 5)
+
+
+def test_dominated_entries_are_removed():
+    index = DominanceIndex()
+    index.add(((0, 0),), 0b001, 4)
+    index.add(((0, 0),), 0b010, 4)
+    index.add(((0, 0),), 0b011, 3)
+    assert index.fronts[((0, 0),)] == [(0b011, 3)]
+
+
+def test_dominance_keys():
+    world = World(
+        """
+        S0 G . X
+        .  . G ."""
+    )
+    problem = GemSearchProblem(world)
+    state = problem.initial_state
+    positions, mask = problem.dominance_key(state)
+    assert positions == ((0, 0),) and mask == 0
+    corner_problem = CornerSearchProblem(world)
+    assert corner_problem.dominance_key(corner_problem.initial_state) == (((0, 0),), 0)
+    visited = CornerProblemState(state.world_state, [(0, 0)], {(0, 0)})
+    assert corner_problem.dominance_key(visited) == (((0, 0),), 0b0001)
+
+
+def test_bfs_gems():
+    world = World(
+        """
+        S0 G . @ X
+        .  . G @ .
+        G  . . . ."""
+    )
+    problem = GemSearchProblem(world)
+    solution = bfs(problem)
+    check_world_done(problem, solution)
+    assert world.n_gems == world.gems_collected
+    assert solution.n_steps == astar(GemSearchProblem(world)).n_steps
+
+
+def test_corners():
+    world = World.from_file("cartes/corners")
+    problem = CornerSearchProblem(world)
+    solution = astar(problem)
+    check_world_done(problem, solution)
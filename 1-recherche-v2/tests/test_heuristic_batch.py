@@ -0,0 +1,38 @@
+from lle import World
+from problem import SimpleSearchProblem, CornerSearchProblem, GemSearchProblem
+
+
+def _reachable_states(problem, limit=300):
+    """ Quelques centaines d'états atteignables depuis l'état initial """
+    states = [problem.initial_state]
+    seen = set(states)
+    for state in states:
+        for successor, _, _ in problem.get_successors(state):
+            if successor not in seen:
+                seen.add(successor)
+                states.append(successor)
+        if len(states) >= limit:
+            break
+    return states
+
+
+def _check_batch(problem):
+    states = _reachable_states(problem)
+    assert problem.heuristic_batch(states) == [problem.heuristic(state) for state in states]
+    assert problem.heuristic_batch([]) == []
+
+
+def test_simple():
+    _check_batch(SimpleSearchProblem(World.from_file("cartes/2_agents/zigzag")))
+
+
+def test_corners():
+    _check_batch(CornerSearchProblem(World.from_file("cartes/corners")))
+
+
+def test_gems():
+    _check_batch(GemSearchProblem(World.from_file("cartes/gems")))
+
+
+def test_gems_without_gems():
+    _check_batch(GemSearchProblem(World("S0 . . X")))
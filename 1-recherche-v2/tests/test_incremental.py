@@ -0,0 +1,82 @@
+import pytest
+from lle import World
+from search import astar
+from problem import SimpleSearchProblem, CornerSearchProblem, GemSearchProblem
+from incremental import IncrementalAStar
+
+from .utils import check_world_done
+
+
+def fresh_astar(problem_class, world, state):
+    """ Nouvelle recherche A* depuis l'état donné, pour comparer avec la replanification """
+    problem = problem_class(world)
+    problem.initial_state = state
+    return astar(problem), problem.nodes_expanded
+
+
+def test_same_solution_as_astar():
+    world = World.from_file("cartes/1_agent/zigzag")
+    problem = SimpleSearchProblem(world)
+    solution = IncrementalAStar(problem).replan(problem.initial_state)
+    assert solution.n_steps == astar(SimpleSearchProblem(world)).n_steps
+    check_world_done(problem, solution)
+
+
+def test_replan_along_plan_gems():
+    world = World.from_file("cartes/gems")
+    problem = GemSearchProblem(world)
+    planner = IncrementalAStar(problem)
+    solution = planner.replan(problem.initial_state)
+    expanded = problem.nodes_expanded
+    world.reset()
+    for k, action in enumerate(solution.actions[:5]):
+        world.step(action)
+        new_solution = planner.replan(problem.get_problem_state(world.get_state()))
+        assert new_solution.actions == solution.actions[k + 1 :]
+    # Le départ est sur le dernier plan : aucune recherche, aucun nouvel appel à get_successors
+    assert problem.nodes_expanded == expanded
+    for action in new_solution.actions:
+        world.step(action)
+    assert world.done and world.n_gems == world.gems_collected
+
+
+def test_replan_off_plan_never_worse_than_astar():
+    world = World.from_file("cartes/2_agents/zigzag")
+    problem = GemSearchProblem(world)
+    planner = IncrementalAStar(problem)
+    solution = planner.replan(problem.initial_state)
+    # On s'écarte du plan : une autre action jointe que la première action prévue
+    state, _, _ = next(
+        successor
+        for successor in problem.get_successors(problem.initial_state)
+        if successor[1] != solution.actions[0] and successor[0] not in planner.plan
+    )
+    expanded = problem.nodes_expanded
+    new_solution = planner.replan(state)
+    fresh_solution, fresh_expanded = fresh_astar(GemSearchProblem, world, state)
+    assert new_solution.actions == fresh_solution.actions
+    assert problem.nodes_expanded - expanded < fresh_expanded
+    world.set_state(state.world_state)
+    for action in new_solution.actions:
+        world.step(action)
+    assert world.done
+
+
+def test_corners_need_problem_state():
+    world = World.from_file("cartes/corners")
+    problem = CornerSearchProblem(world)
+    planner = IncrementalAStar(problem)
+    solution = planner.replan(problem.initial_state)
+    # Les coins visités ne se déduisent pas de l'état du monde : on suit les états du problème
+    state = problem.initial_state
+    for action in solution.actions[:3]:
+        state = next(successor for successor, actions, _ in problem.get_successors(state) if actions == action)
+    assert planner.replan(state).actions == solution.actions[3:]
+    with pytest.raises(NotImplementedError):
+        problem.get_problem_state(world.get_state())
+
+
+def test_impossible():
+    world = World.from_file("cartes/2_agents/impossible")
+    problem = SimpleSearchProblem(world)
+    assert IncrementalAStar(problem).replan(problem.initial_state) is None
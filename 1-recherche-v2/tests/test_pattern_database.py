@@ -0,0 +1,51 @@
+import pytest
+from lle import World
+from problem import GemSearchProblem
+from search import astar, bfs
+from pattern_database import build
+
+from .utils import check_world_done
+
+
+def test_gems_collected(tmp_path):
+    world = World.from_file("cartes/gems")
+    build(world, str(tmp_path), pattern_size=3, n_workers=2)
+    problem = GemSearchProblem(world, pattern_database=str(tmp_path))
+    solution = astar(problem)
+    check_world_done(problem, solution)
+    assert world.n_gems == world.gems_collected
+
+
+def test_heuristic_is_admissible(tmp_path):
+    world = World(
+        """
+        S0 . G @ X
+        .  G . @ .
+        G  . . . ."""
+    )
+    build(world, str(tmp_path), pattern_size=2, n_workers=1)
+    problem = GemSearchProblem(world, pattern_database=str(tmp_path))
+
+    # États à comparer : ceux de la solution et tous leurs successeurs
+    states = [problem.initial_state]
+    for action in bfs(GemSearchProblem(world)).actions:
+        states.append(next(s for s, a, _ in problem.get_successors(states[-1]) if a == action))
+    states += [successor for state in states[:] for successor, _, _ in problem.get_successors(state)]
+
+    for state in states:
+        # Coût réel restant, calculé par une recherche en largeur depuis l'état
+        exact = GemSearchProblem(world)
+        exact.initial_state = state
+        solution = bfs(exact)
+        if solution is not None:
+            assert problem.heuristic(state) <= solution.n_steps
+    assert problem.heuristic(problem.initial_state) > 0
+
+
+def test_wrong_world(tmp_path):
+    build(World("S0 G X\n.  . ."), str(tmp_path), n_workers=1)
+    GemSearchProblem(World("S0 G X\n.  . ."), pattern_database=str(tmp_path))
+    # Autre taille, puis même taille avec une gemme, une sortie, un mur ou une source laser à un autre endroit
+    for other in ["S0 . G . X", "S0 X G\n.  . .", "S0 G .\n.  . X", "S0 G X\n.  @ .", "S0 G X\n.  L0E ."]:
+        with pytest.raises(ValueError):
+            GemSearchProblem(World(other), pattern_database=str(tmp_path))
@@ -0,0 +1,12 @@
+from priority_queue import PriorityQueue
+
+
+def test_truncate_keeps_lowest_priorities():
+    queue = PriorityQueue()
+    for item, priority in [("c", 3), ("a", 1), ("e", 5), ("b", 2), ("d", 4)]:
+        queue.push(item, priority)
+    assert sorted(queue.truncate(2)) == ["c", "d", "e"]
+    assert len(queue) == 2
+    assert queue.pop() == "a"
+    assert queue.pop() == "b"
+    assert queue.truncate(10) == []